@@ -1,3 +1,5 @@
+from typing import Any, Dict
+
 # IP Services Configuration
 IP_CHECK_SERVICES = [
     'https://api.ipify.org?format=json',
@@ -9,22 +11,53 @@ IP_CHECK_SERVICES = [
 # Service response types
 JSON_SERVICES = ['api.ipify.org?format=json']
 
+# Most bytes read from an IP service response (anything longer isn't an IP)
+IP_RESPONSE_MAX_BYTES = 256
+
+# DNS-based IP check (tried before the HTTP services above)
+DNS_IP_CHECK: Dict[str, Any] = {
+    'enabled': True,  # Whether to look up our IP via DNS first
+    'query': 'myip.opendns.com',  # Name that resolves to the client's IP
+    'nameservers': ['208.67.222.222', '208.67.220.220'],  # OpenDNS resolvers
+    'timeout': 5  # Total time allowed for the DNS lookup
+}
+
 # DNS Record Configuration
-DNS_SETTINGS = {
-    'proxied': False,  # Whether to proxy through Cloudflare
-    'ttl': 1,  # TTL value for DNS record
+DNS_SETTINGS: Dict[str, Any] = {
+    'proxied': None,  # Whether to proxy through Cloudflare (None leaves the current setting)
+    'ttl': None,  # TTL value for DNS record, 1 for automatic (None leaves the current setting)
     'skip_connection_test': False  # Whether to skip initial Cloudflare connection test
 }
 
+# DNS Cache Configuration
+DNS_CACHE: Dict[str, Any] = {
+    'hosts': ['api.cloudflare.com'],  # Hosts whose resolved addresses are cached
+    'ttl': 900  # How long to cache resolved addresses (seconds)
+}
+
+# Network Change Detection
+NETWORK_WATCH: Dict[str, Any] = {
+    'enabled': True  # Check immediately when a local IPv4 address changes (Linux only)
+}
+
+# State Configuration
+STATE: Dict[str, Any] = {
+    'file': '~/.drewdyndns.state',  # Where the record ID and last known IP are saved between runs
+}
+
 # Logging Configuration
-LOGGING = {
+LOGGING: Dict[str, Any] = {
     'verbose': True,  # Enable debug logging
 }
 
 # Timing Configuration (in seconds)
-TIMERS = {
+TIMERS: Dict[str, Any] = {
     'check_interval': 3600,  # Default interval between checks
     'retry_interval': 60,    # How long to wait after an error before retry
+    'max_retry_interval': 900,  # Cap for the retry interval as it doubles on repeated errors
+    'dns_verify_interval': 43200,  # How long to trust a matching DNS record before checking Cloudflare again
+    'service_backoff': 60,   # How long to skip an IP service after it fails (doubles on repeated failures)
+    'max_service_backoff': 3600,  # Cap for how long a failing IP service is skipped
     'timeout': {
         'connect': 5,        # Connection timeout
         'read': 10          # Read timeout
@@ -1,8 +1,21 @@
 import requests
 import time
+import random
+import functools
 import os
+import signal
+import threading
+import json
+import socket
+import select
+import platform
+import ipaddress
 from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional
 import logging
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import dns.resolver
 from dotenv import load_dotenv
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -21,17 +34,109 @@ logging.basicConfig(
         logging.StreamHandler()
     ]
 )
+# Don't let a failing log handler interrupt the updater
+logging.raiseExceptions = False
+
+class Settings(NamedTuple):
+    """Timer and DNS settings, resolved once from config.py and the environment."""
+    check_interval: int
+    retry_interval: int
+    max_retry_interval: int
+    dns_verify_interval: int
+    service_backoff: int
+    max_service_backoff: int
+    connect_timeout: float
+    read_timeout: float
+    proxied: Optional[bool]
+    ttl: Optional[int]
+    skip_connection_test: bool
+
+# Use config values but allow the check interval to be overridden from the environment
+CFG = Settings(
+    check_interval=int(os.getenv('CHECK_INTERVAL', str(config.TIMERS['check_interval']))),
+    retry_interval=config.TIMERS['retry_interval'],
+    max_retry_interval=config.TIMERS['max_retry_interval'],
+    dns_verify_interval=config.TIMERS['dns_verify_interval'],
+    service_backoff=config.TIMERS['service_backoff'],
+    max_service_backoff=config.TIMERS['max_service_backoff'],
+    connect_timeout=config.TIMERS['timeout']['connect'],
+    read_timeout=config.TIMERS['timeout']['read'],
+    proxied=config.DNS_SETTINGS['proxied'],
+    ttl=config.DNS_SETTINGS['ttl'],
+    skip_connection_test=config.DNS_SETTINGS['skip_connection_test']
+)
+
+# Cache DNS lookups for the Cloudflare API host so every API call doesn't resolve it again
+original_getaddrinfo = socket.getaddrinfo
+address_cache: Dict[tuple, tuple] = {}
+
+def cached_getaddrinfo(host: Any, port: Any, family: int = 0, type: int = 0, proto: int = 0, flags: int = 0) -> list:
+    """socket.getaddrinfo that caches results for the hosts in config.DNS_CACHE."""
+    if host not in config.DNS_CACHE['hosts']:
+        return original_getaddrinfo(host, port, family, type, proto, flags)
+
+    key = (host, port, family, type, proto, flags)
+    cached = address_cache.get(key)
+    if cached and time.monotonic() < cached[0]:
+        return cached[1]
+
+    result = original_getaddrinfo(host, port, family, type, proto, flags)
+    address_cache[key] = (time.monotonic() + config.DNS_CACHE['ttl'], result)
+    return result
+
+def clear_address_cache() -> None:
+    """Forget cached addresses, e.g. after a connection error."""
+    logging.debug("Clearing cached Cloudflare API addresses")
+    address_cache.clear()
+
+socket.getaddrinfo = cached_getaddrinfo
+
+# Netlink multicast group for IPv4 address changes (from linux/rtnetlink.h)
+RTMGRP_IPV4_IFADDR = 0x10
+
+def normalize_record_name(name: str) -> str:
+    """Normalize a DNS name so names from the environment and Cloudflare compare equal."""
+    return name.strip().rstrip('.').lower()
+
+def jittered_backoff_time(self: Retry) -> float:
+    """Retry backoff time plus random jitter so clients don't retry in lockstep."""
+    backoff = Retry.get_backoff_time(self)
+    return backoff + random.uniform(0, 0.5 * backoff)
+
+# Retry strategy with jittered backoff. Built with type() rather than a class
+# statement because urllib3's Retry has a metaclass, which mypyc can't subclass.
+# partialmethod lets the function bind as a method even when compiled
+JitteredRetry: Any = type('JitteredRetry', (Retry,), {
+    'get_backoff_time': functools.partialmethod(jittered_backoff_time)
+})
 
 class CloudflareDNSUpdater:
-    def __init__(self):
+    record_names: List[str]
+    headers: Dict[str, str]
+    update_template: Dict[str, Any]
+    json_services: frozenset
+    dns_service: str
+    service_failures: Dict[str, int]
+    service_retry_at: Dict[str, float]
+    current_ip: Optional[str]
+    records: Dict[str, Dict[str, Any]]
+    dns_etag: Optional[str]
+    dns_verified_until: float
+    consecutive_failures: int
+    last_verified: float
+    state_file: str
+
+    def __init__(self) -> None:
         # Cloudflare API configuration
         self.cf_api_token = os.getenv('CF_API_TOKEN')
         self.cf_api_key = os.getenv('CF_API_KEY')
         self.cf_email = os.getenv('CF_EMAIL')
         self.zone_id = os.getenv('CF_ZONE_ID')
-        self.record_name = os.getenv('CF_RECORD_NAME')
-        # Use config value but allow override from environment
-        self.check_interval = int(os.getenv('CHECK_INTERVAL', str(config.TIMERS['check_interval'])))
+        # One or more comma-separated record names
+        self.record_names = list(dict.fromkeys(
+            normalize_record_name(name) for name in os.getenv('CF_RECORD_NAME', '').split(',')
+            if normalize_record_name(name)
+        ))
         
         # Determine authentication method
         if self.cf_api_token:
@@ -50,33 +155,84 @@ class CloudflareDNSUpdater:
         else:
             raise ValueError("Missing authentication credentials. Provide either CF_API_TOKEN or both CF_API_KEY and CF_EMAIL")
         
-        if not self.zone_id or not self.record_name:
+        if not self.zone_id or not self.record_names:
             raise ValueError("Missing required environment variables: CF_ZONE_ID and CF_RECORD_NAME are required")
         
         self.cf_api_url = f"https://api.cloudflare.com/client/v4/zones/{self.zone_id}/dns_records"
         
+        # Fixed part of the update request body. Only send the fields we want to
+        # change so settings made in the Cloudflare dashboard are left alone
+        self.update_template = {}
+        if CFG.proxied is not None:
+            self.update_template['proxied'] = CFG.proxied
+        if CFG.ttl is not None:
+            self.update_template['ttl'] = CFG.ttl
+        
+        # Resolve which IP check services return JSON once, rather than on every check
+        self.json_services = frozenset(
+            service for service in config.IP_CHECK_SERVICES
+            if any(json_service in service for json_service in config.JSON_SERVICES)
+        )
+        
+        # Failure counts and monotonic retry times for the IP check services
+        # The DNS lookup is tracked the same way, under its own key
+        self.dns_service = f"dns:{config.DNS_IP_CHECK['query']}"
+        self.service_failures = {service: 0 for service in [self.dns_service, *config.IP_CHECK_SERVICES]}
+        self.service_retry_at = {service: 0.0 for service in [self.dns_service, *config.IP_CHECK_SERVICES]}
+        
+        # Worker threads for querying the IP services in parallel, created once and
+        # reused every check. Twice the service count so requests still finishing
+        # from a previous check don't hold up the next one
+        self.ip_executor = ThreadPoolExecutor(
+            max_workers=2 * len(config.IP_CHECK_SERVICES),
+            thread_name_prefix='ip-check'
+        )
+        
+        # Resolver for looking up our IP via DNS before falling back to the HTTP services
+        self.ip_resolver = dns.resolver.Resolver(configure=False)
+        self.ip_resolver.nameservers = config.DNS_IP_CHECK['nameservers']
+        self.ip_resolver.lifetime = config.DNS_IP_CHECK['timeout']
+        
         # Keep track of the current IP
         self.current_ip = None
-        self.record_id = None
+        # Known DNS records by name: record ID, update URL and last seen content
+        self.records = {}
+        # ETag of the last DNS record lookup, used for conditional requests
+        self.dns_etag = None
+        # Monotonic time until which a matching DNS record is trusted without re-checking
+        self.dns_verified_until = 0.0
+        # Number of checks in a row that have failed, used to back off retries
+        self.consecutive_failures = 0
+        # Wall-clock time the DNS record was last confirmed to match current_ip
+        self.last_verified = 0.0
+        # Set to cut a wait short (recheck now), or to stop the main loop
+        self.wake = threading.Event()
+        self.stop = threading.Event()
+        
+        # Restore what we knew about the record before the last restart
+        self.state_file = os.path.expanduser(config.STATE['file'])
+        self.load_state()
         
         # Set up requests session with retry logic and timeouts
         self.session = requests.Session()
         
         # Create retry strategy based on urllib3 version
         try:
-            retry_strategy = Retry(
+            retry_strategy = JitteredRetry(
                 total=3,  # number of retries
-                backoff_factor=1,  # wait 1, 2, 4 seconds between retries
+                backoff_factor=1,  # wait 1, 2, 4 seconds (plus jitter) between retries
                 status_forcelist=[429, 500, 502, 503, 504],  # HTTP status codes to retry on
-                allowed_methods=["GET", "PUT"]  # New parameter name
+                allowed_methods=["GET", "PATCH"],  # New parameter name
+                respect_retry_after_header=True  # Honor Cloudflare's Retry-After on 429/503
             )
         except TypeError:
             # Fallback for older versions of urllib3
-            retry_strategy = Retry(
+            retry_strategy = JitteredRetry(
                 total=3,
                 backoff_factor=1,
                 status_forcelist=[429, 500, 502, 503, 504],
-                method_whitelist={"GET", "PUT"}  # Old parameter name
+                method_whitelist={"GET", "PATCH"},  # Old parameter name
+                respect_retry_after_header=True
             )
 
         adapter = HTTPAdapter(
@@ -87,23 +243,37 @@ class CloudflareDNSUpdater:
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
+        # Separate session for Cloudflare so its auth headers are set once and
+        # its single keep-alive connection isn't shared with the IP check services
+        self.cf_session = requests.Session()
+        self.cf_session.headers.update(self.headers)
+        cf_adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=1,
+            pool_maxsize=1
+        )
+        self.cf_session.mount("https://", cf_adapter)
+        
         # Set default timeouts for all requests
         self.session.timeout = (
-            config.TIMERS['timeout']['connect'],
-            config.TIMERS['timeout']['read']
+            CFG.connect_timeout,
+            CFG.read_timeout
         )
         
         logging.debug("Initializing CloudflareDNSUpdater")
-        logging.debug(f"Using API URL: {self.cf_api_url}")
-        logging.debug(f"Check interval set to: {self.check_interval} seconds")
+        logging.debug("Using API URL: %s", self.cf_api_url)
+        logging.debug("Check interval set to: %s seconds", CFG.check_interval)
         
         # Test connection to Cloudflare API if not disabled
-        if not config.DNS_SETTINGS['skip_connection_test']:
+        if CFG.skip_connection_test:
+            logging.debug("Skipping Cloudflare connection test")
+        elif time.monotonic() < self.dns_verified_until:
+            logging.debug("Skipping Cloudflare connection test (record verified recently)")
+        else:
             try:
                 logging.debug("Testing connection to Cloudflare API...")
-                test_response = self.session.get(
+                test_response = self.cf_session.get(
                     "https://api.cloudflare.com/client/v4/user/tokens/verify",
-                    headers=self.headers,
                     timeout=(5, 10)
                 )
                 test_response.raise_for_status()
@@ -118,155 +288,424 @@ class CloudflareDNSUpdater:
                 logging.error("SSL Error - there might be a proxy or SSL inspection interfering with the connection")
                 raise
             except requests.exceptions.ConnectionError as e:
-                logging.error(f"Connection Error: {e}")
+                logging.error("Connection Error: %s", e)
                 logging.error("Check if api.cloudflare.com is accessible from your network")
                 raise
             except Exception as e:
-                logging.error(f"Unexpected error while testing Cloudflare API connection: {e}")
+                logging.error("Unexpected error while testing Cloudflare API connection: %s", e)
                 raise
-        else:
-            logging.debug("Skipping Cloudflare connection test")
 
-    def get_external_ip(self):
+    def set_record(self, name: str, record_id: str, content: Optional[str] = None) -> None:
+        """Remember a DNS record's ID, content and the update URL that goes with it."""
+        self.records[name] = {
+            'id': record_id,
+            'update_url': f"{self.cf_api_url}/{record_id}",
+            'content': content
+        }
+
+    def is_valid_state(self, state: Dict[str, Any]) -> bool:
+        """Check that a loaded state object has the types save_state writes."""
+        record_ids = state.get('record_ids', {})
+        current_ip = state.get('current_ip')
+        last_verified = state.get('last_verified', 0)
+        return (
+            isinstance(record_ids, dict)
+            and all(isinstance(record_id, str) for record_id in record_ids.values())
+            and (current_ip is None or isinstance(current_ip, str))
+            # bool is a subclass of int, but never a valid timestamp
+            and isinstance(last_verified, (int, float)) and not isinstance(last_verified, bool)
+        )
+
+    def load_state(self) -> None:
+        """Load the record ID and last known IP saved by a previous run."""
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            logging.debug("No saved state found at %s", self.state_file)
+            return
+        except Exception as e:
+            logging.warning("Failed to load saved state from %s: %s", self.state_file, e)
+            return
+
+        if not isinstance(state, dict) or not self.is_valid_state(state):
+            logging.warning("Failed to load saved state from %s: unexpected format", self.state_file)
+            return
+
+        # Ignore state saved for different records
+        if state.get('zone_id') != self.zone_id or state.get('record_names') != self.record_names:
+            logging.debug("Saved state is for different records, ignoring it")
+            return
+
+        for name, record_id in state.get('record_ids', {}).items():
+            self.set_record(name, record_id)
+        self.current_ip = state.get('current_ip')
+        self.last_verified = float(state.get('last_verified', 0))
+
+        # Carry over whatever is left of the verification window
+        remaining = CFG.dns_verify_interval - (time.time() - self.last_verified)
+        if self.current_ip and remaining > 0:
+            self.dns_verified_until = time.monotonic() + remaining
+        logging.debug("Loaded saved state: records %s, IP %s", list(self.records), self.current_ip)
+
+    def save_state(self) -> None:
+        """Save the record IDs and current IP so a restart can skip the initial lookups."""
+        state = {
+            'zone_id': self.zone_id,
+            'record_names': self.record_names,
+            'record_ids': {name: record['id'] for name, record in self.records.items()},
+            'current_ip': self.current_ip,
+            'last_verified': self.last_verified
+        }
+        try:
+            # Write to a temporary file first so a crash can't leave a half-written state file
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_file, self.state_file)
+            logging.debug("Saved state to %s", self.state_file)
+        except Exception as e:
+            logging.warning("Failed to save state to %s: %s", self.state_file, e)
+
+    def get_external_ip_from_dns(self) -> Optional[str]:
+        """Get the current external IP address with a single DNS query."""
+        query = config.DNS_IP_CHECK['query']
+        try:
+            logging.debug("Querying %s via %s", query, self.ip_resolver.nameservers)
+            answer = self.ip_resolver.resolve(query, 'A')
+            ip = answer[0].to_text()
+            logging.debug("Successfully got IP from DNS: %s", ip)
+            self.mark_service_succeeded(self.dns_service)
+            return ip
+        except Exception as e:
+            logging.warning("Failed to get IP from DNS: %s", e)
+            self.mark_service_failed(self.dns_service)
+            return None
+
+    def mark_service_failed(self, service: str) -> None:
+        """Skip a failing IP service for a while, backing off further on each failure."""
+        backoff = min(
+            CFG.service_backoff * 2 ** self.service_failures[service],
+            CFG.max_service_backoff
+        )
+        if backoff < CFG.max_service_backoff:
+            self.service_failures[service] += 1
+        self.service_retry_at[service] = time.monotonic() + backoff
+        logging.debug("Skipping %s for %s seconds", service, backoff)
+
+    def mark_service_succeeded(self, service: str) -> None:
+        """Clear any backoff for an IP service that answered."""
+        self.service_failures[service] = 0
+        self.service_retry_at[service] = 0.0
+
+    def fetch_ip_response(self, service: str) -> bytes:
+        """Fetch the start of an IP service's response, without downloading an oversized body."""
+        with self.session.get(service, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            # Chunks can be shorter than asked for, so keep reading up to the cap
+            content = b''
+            for chunk in response.iter_content(config.IP_RESPONSE_MAX_BYTES):
+                content += chunk
+                if len(content) >= config.IP_RESPONSE_MAX_BYTES:
+                    break
+            return content[:config.IP_RESPONSE_MAX_BYTES]
+
+    def get_external_ip(self) -> Optional[str]:
         """Get the current external IP address."""
         logging.debug("Attempting to get external IP address")
         try:
-            for service in config.IP_CHECK_SERVICES:
-                try:
-                    logging.debug(f"Trying IP service: {service}")
-                    response = self.session.get(service, timeout=10)
-                    response.raise_for_status()
-                    
-                    # Check if this is a JSON service
-                    if any(json_service in service for json_service in config.JSON_SERVICES):
-                        ip = response.json()['ip']
-                    else:
-                        ip = response.text.strip()
-                        
-                    logging.debug(f"Successfully got IP from {service}: {ip}")
+            # Try the cheap DNS lookup first, unless it failed recently
+            if config.DNS_IP_CHECK['enabled'] and time.monotonic() >= self.service_retry_at[self.dns_service]:
+                ip = self.get_external_ip_from_dns()
+                if ip:
                     return ip
-                except Exception as e:
-                    logging.warning(f"Failed to get IP from {service}: {e}")
-                    continue
+            
+            # Skip services that failed recently, unless that would leave nothing to try
+            now = time.monotonic()
+            services = [
+                service for service in config.IP_CHECK_SERVICES
+                if now >= self.service_retry_at[service]
+            ]
+            if not services:
+                logging.debug("All IP services failed recently, trying them all anyway")
+                services = config.IP_CHECK_SERVICES
+            
+            # Query the services in parallel and take the first good answer
+            futures = {
+                self.ip_executor.submit(self.fetch_ip_response, service): service
+                for service in services
+            }
+            try:
+                for future in as_completed(futures):
+                    service = futures[future]
+                    try:
+                        content = future.result()
+                        
+                        # Check if this is a JSON service
+                        if service in self.json_services:
+                            raw_ip = orjson.loads(content)['ip']
+                        else:
+                            raw_ip = content.decode('utf-8', errors='replace')
+                        # Reject anything that isn't an IPv4 address (HTML error pages, IPv6, ...)
+                        ip = str(ipaddress.IPv4Address(raw_ip.strip()))
+                            
+                        logging.debug("Successfully got IP from %s: %s", service, ip)
+                        self.mark_service_succeeded(service)
+                        return ip
+                    except Exception as e:
+                        logging.warning("Failed to get IP from %s: %s", service, e)
+                        self.mark_service_failed(service)
+                        continue
+            finally:
+                # Don't wait on slower services once we have an answer
+                for future in futures:
+                    future.cancel()
             
             logging.error("All IP detection services failed")
             return None
             
         except Exception as e:
-            logging.error(f"Failed to get external IP: {e}")
+            logging.error("Failed to get external IP: %s", e)
             return None
 
-    def get_dns_record(self):
-        """Get the current DNS record ID and content."""
-        logging.debug(f"Getting DNS record for {self.record_name}")
+    def get_dns_records(self) -> Optional[Dict[str, str]]:
+        """Get the current content of all our DNS records with a single request."""
+        logging.debug("Getting DNS records for %s", ', '.join(self.record_names))
         try:
+            # A single record can be filtered by name; otherwise list the zone's A records
+            params: Dict[str, Any]
+            if len(self.record_names) == 1:
+                params = {'type': 'A', 'name': self.record_names[0]}
+            else:
+                params = {'type': 'A', 'per_page': 5000}
+            
+            # Ask Cloudflare to skip the body if the records haven't changed since last time
+            headers = {}
+            if self.dns_etag:
+                headers['If-None-Match'] = self.dns_etag
+            
             logging.debug("Initiating request to Cloudflare API...")
-            response = self.session.get(
+            response = self.cf_session.get(
                 self.cf_api_url,
-                headers=self.headers,
-                params={'name': self.record_name},
+                params=params,
+                headers=headers,
                 timeout=(5, 10)  # (connect timeout, read timeout)
             )
             logging.debug("Request completed")
             response.raise_for_status()
             
-            result = response.json()
-            logging.debug(f"Cloudflare API response: {result}")
+            if response.status_code == 304:
+                contents = {name: record['content'] for name, record in self.records.items()}
+                logging.debug("DNS records not modified, using cached content: %s", contents)
+                return contents
+            
+            result = orjson.loads(response.content)
+            logging.debug("Cloudflare API response: %s", result)
             
             if not result.get('success', False):
-                logging.error(f"Cloudflare API error: {result.get('errors', [])}")
+                logging.error("Cloudflare API error: %s", result.get('errors', []))
                 return None
                 
-            records = result.get('result', [])
-            if records:
-                self.record_id = records[0]['id']
-                logging.debug(f"Found record ID: {self.record_id}")
-                return records[0]['content']
-            logging.debug("No DNS records found")
-            return None
+            if result.get('result_info', {}).get('total_pages', 1) > 1:
+                logging.warning("Cloudflare returned more than one page of A records, only the first is checked")
+            
+            # Keep the first A record for each of our names
+            found: Dict[str, Dict[str, Any]] = {}
+            for record in result.get('result', []):
+                name = normalize_record_name(record['name'])
+                if record.get('type') == 'A' and name in self.record_names:
+                    found.setdefault(name, record)
+            if not found:
+                logging.debug("No DNS records found")
+                return None
+            
+            ids_changed = False
+            for name, record in found.items():
+                ids_changed = ids_changed or self.records.get(name, {}).get('id') != record['id']
+                self.set_record(name, record['id'], record['content'])
+                logging.debug("Found record ID for %s: %s", name, record['id'])
+            for name in self.record_names:
+                if name not in found:
+                    logging.warning("No DNS record found for %s", name)
+                    self.records.pop(name, None)
+            if ids_changed:
+                self.save_state()
+            
+            self.dns_etag = response.headers.get('ETag')
+            return {name: record['content'] for name, record in found.items()}
         except Exception as e:
-            logging.error(f"Failed to get DNS record: {e}")
+            logging.error("Failed to get DNS records: %s", e)
+            # Cloudflare's addresses may have changed
+            if isinstance(e, requests.exceptions.ConnectionError):
+                clear_address_cache()
             return None
 
-    def update_dns_record(self, new_ip):
-        """Update the DNS record with the new IP."""
-        logging.debug(f"Attempting to update DNS record to {new_ip}")
-        if not self.record_id:
-            logging.error("No record ID found")
+    def update_dns_record(self, name: str, new_ip: str) -> bool:
+        """Update a DNS record with the new IP."""
+        logging.debug("Attempting to update DNS record %s to %s", name, new_ip)
+        record = self.records.get(name)
+        if not record:
+            logging.error("No record ID found for %s", name)
             return False
 
         try:
-            data = {
-                'content': new_ip,
-                'name': self.record_name,
-                'proxied': config.DNS_SETTINGS['proxied'],
-                'type': 'A',
-                'ttl': config.DNS_SETTINGS['ttl']
-            }
-            logging.debug(f"Update request data: {data}")
+            data = {**self.update_template, 'content': new_ip}
+            logging.debug("Update request data: %s", data)
 
-            response = self.session.put(
-                f"{self.cf_api_url}/{self.record_id}",
-                headers=self.headers,
+            response = self.cf_session.patch(
+                record['update_url'],
                 json=data,
                 timeout=10
             )
             response.raise_for_status()
             
-            result = response.json()
-            logging.debug(f"Cloudflare API response: {result}")
+            result = orjson.loads(response.content)
+            logging.debug("Cloudflare API response: %s", result)
             
             if not result.get('success', False):
-                logging.error(f"Cloudflare API error: {result.get('errors', [])}")
+                logging.error("Cloudflare API error: %s", result.get('errors', []))
                 return False
                 
-            logging.info(f"Successfully updated DNS record to {new_ip}")
+            # The cached lookup is stale now
+            self.dns_etag = None
+            record['content'] = new_ip
+            logging.info("Successfully updated DNS record %s to %s", name, new_ip)
             return True
         except Exception as e:
-            logging.error(f"Failed to update DNS record: {e}")
-            return None
+            logging.error("Failed to update DNS record %s: %s", name, e)
+            # Cloudflare's addresses may have changed
+            if isinstance(e, requests.exceptions.ConnectionError):
+                clear_address_cache()
+            return False
+
+    def get_retry_delay(self) -> int:
+        """Get how long to wait after a failed check, doubling on each consecutive failure."""
+        delay = CFG.retry_interval * 2 ** self.consecutive_failures
+        if delay < CFG.max_retry_interval:
+            self.consecutive_failures += 1
+        delay = min(delay, CFG.max_retry_interval)
+        logging.debug("Retrying in %s seconds after %s consecutive failures", delay, self.consecutive_failures)
+        return delay
+
+    def wait(self, seconds: float) -> None:
+        """Wait for the given number of seconds, or until woken by a signal."""
+        self.wake.wait(seconds)
+        self.wake.clear()
+
+    def handle_recheck_signal(self, signum: int, frame: Any) -> None:
+        """Cut the current wait short and fully recheck the IP and DNS record."""
+        logging.info("Received signal %s, checking now", signum)
+        self.dns_verified_until = 0.0
+        self.wake.set()
+
+    def handle_stop_signal(self, signum: int, frame: Any) -> None:
+        """Stop the main loop after the current check."""
+        logging.info("Received signal %s, shutting down", signum)
+        self.stop.set()
+        self.wake.set()
+
+    def watch_address_changes(self) -> None:
+        """Wake the main loop whenever a local IPv4 address changes (Linux netlink)."""
+        try:
+            netlink = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            netlink.bind((0, RTMGRP_IPV4_IFADDR))
+        except Exception as e:
+            logging.warning("Failed to watch for address changes, falling back to polling: %s", e)
+            return
+
+        logging.debug("Watching for local IPv4 address changes")
+        with netlink:
+            while not self.stop.is_set():
+                readable, _, _ = select.select([netlink], [], [], 1)
+                if not readable:
+                    continue
+                # Drain the pending messages; we only care that something changed
+                while select.select([netlink], [], [], 0)[0]:
+                    netlink.recv(65535)
+                logging.info("Local IPv4 address changed, checking now")
+                self.wake.set()
 
-    def run(self):
+    def run(self) -> None:
         """Main loop to check and update IP address."""
+        # Check as soon as the local address changes instead of waiting for the next poll
+        if config.NETWORK_WATCH['enabled']:
+            if platform.system() == 'Linux' and hasattr(socket, 'AF_NETLINK'):
+                threading.Thread(target=self.watch_address_changes, daemon=True).start()
+            else:
+                logging.debug("Address change watching is only supported on Linux, polling only")
+
+        # SIGUSR1 isn't available on Windows
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self.handle_recheck_signal)
+        signal.signal(signal.SIGTERM, self.handle_stop_signal)
+        signal.signal(signal.SIGINT, self.handle_stop_signal)
+
         logging.debug("Starting main update loop")
-        while True:
+        while not self.stop.is_set():
             try:
                 # Get current external IP
                 logging.debug("Starting new check cycle")
                 new_ip = self.get_external_ip()
                 if not new_ip:
                     logging.warning("Could not get external IP, waiting before retry")
-                    time.sleep(config.TIMERS['retry_interval'])
+                    self.wait(self.get_retry_delay())
                     continue
 
-                # Get current DNS record
-                dns_ip = self.get_dns_record()
-                if not dns_ip:
-                    logging.warning("Could not get DNS record, waiting before retry")
-                    time.sleep(config.TIMERS['retry_interval'])
+                # Skip the DNS lookup if the IP hasn't changed and the records were verified recently
+                if new_ip == self.current_ip and time.monotonic() < self.dns_verified_until:
+                    logging.info("No IP change detected: %s (DNS records recently verified)", new_ip)
+                    self.consecutive_failures = 0
+                    logging.info("Waiting %s seconds before next check", CFG.check_interval)
+                    self.wait(CFG.check_interval)
                     continue
 
-                # First run initialization
-                if self.current_ip is None:
+                # Get current DNS records
+                dns_ips = self.get_dns_records()
+                if not dns_ips:
+                    logging.warning("Could not get DNS records, waiting before retry")
+                    self.wait(self.get_retry_delay())
+                    continue
+
+                # Update any record that doesn't match the current IP
+                all_updated = len(dns_ips) == len(self.record_names)
+                update_attempted = False
+                for name, dns_ip in dns_ips.items():
+                    if new_ip == dns_ip:
+                        continue
+                    logging.info("Update needed for %s - External IP: %s, Cached IP: %s, DNS IP: %s", name, new_ip, self.current_ip, dns_ip)
+                    update_attempted = True
+                    if not self.update_dns_record(name, new_ip):
+                        all_updated = False
+
+                if all_updated and not update_attempted:
+                    logging.info("No IP change detected: %s (DNS records match)", new_ip)
                     self.current_ip = new_ip
-                
-                # Check if either our cached IP or DNS record doesn't match the current IP
-                if new_ip != self.current_ip or new_ip != dns_ip:
-                    logging.info(f"Update needed - External IP: {new_ip}, Cached IP: {self.current_ip}, DNS IP: {dns_ip}")
-                    if self.update_dns_record(new_ip):
-                        self.current_ip = new_ip
+                    self.dns_verified_until = time.monotonic() + CFG.dns_verify_interval
+                    self.last_verified = time.time()
+                    self.save_state()
                 else:
-                    logging.info(f"No IP change detected: {new_ip} (DNS record matches)")
+                    # Force a fresh DNS lookup on the next check after any update attempt,
+                    # including after a restart
+                    self.dns_verified_until = 0.0
+                    self.last_verified = 0.0
+                    if all_updated:
+                        self.current_ip = new_ip
+                    self.save_state()
 
             except Exception as e:
-                logging.error(f"Unexpected error in main loop: {e}")
-                logging.debug(f"Error details: {str(e)}", exc_info=True)
-                time.sleep(config.TIMERS['retry_interval'])  # Use configured retry interval
+                logging.error("Unexpected error in main loop: %s", e)
+                logging.debug("Error details: %s", e, exc_info=True)
+                self.wait(self.get_retry_delay())
                 continue
 
+            self.consecutive_failures = 0
+
             # Wait for the configured interval before next check
-            logging.info(f"Waiting {self.check_interval} seconds before next check")
-            time.sleep(self.check_interval)
+            logging.info("Waiting %s seconds before next check", CFG.check_interval)
+            self.wait(CFG.check_interval)
+
+        self.ip_executor.shutdown(wait=False)
+        logging.info("Cloudflare DNS Updater stopped")
 
 if __name__ == "__main__":
     logging.info("Starting Cloudflare DNS Updater")
@@ -274,15 +713,14 @@ if __name__ == "__main__":
     
     # Add network diagnostic information
     try:
-        import socket
         logging.debug("Performing network diagnostics...")
         
         # Test DNS resolution
         try:
             cloudflare_ip = socket.gethostbyname('api.cloudflare.com')
-            logging.debug(f"Successfully resolved api.cloudflare.com to {cloudflare_ip}")
+            logging.debug("Successfully resolved api.cloudflare.com to %s", cloudflare_ip)
         except socket.gaierror as e:
-            logging.error(f"Failed to resolve api.cloudflare.com: {e}")
+            logging.error("Failed to resolve api.cloudflare.com: %s", e)
         
         # Test basic connectivity
         try:
@@ -290,11 +728,11 @@ if __name__ == "__main__":
             test_socket.close()
             logging.debug("Successfully established test connection to api.cloudflare.com")
         except Exception as e:
-            logging.error(f"Failed to connect to api.cloudflare.com: {e}")
+            logging.error("Failed to connect to api.cloudflare.com: %s", e)
             logging.error("This might indicate a firewall or proxy issue")
     
     except Exception as e:
-        logging.error(f"Error during network diagnostics: {e}")
+        logging.error("Error during network diagnostics: %s", e)
     
     updater = CloudflareDNSUpdater()
     updater.run()